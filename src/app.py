@@ -1,3 +1,4 @@
+import hashlib
 import os
 import tempfile
 from pathlib import Path
@@ -6,9 +7,18 @@ import pandas as pd
 import plotly.express as px
 import streamlit as st
 
+from libs.tools.model_cascade import (CASCADE_MODELS, CascadeStats,
+                                      read_statement_cascade)
+from libs.tools.page_fingerprint import (FINGERPRINT_STORE_PATH,
+                                         filter_boilerplate_pages,
+                                         get_known_issuers,
+                                         open_fingerprint_store)
 from libs.tools.pdf_2_image import convert_pdf_to_images
 from libs.tools.state_2_csv import statement_to_csv
 from libs.tools.statement_reader import read_statement
+from libs.tools.transaction_dedup import (LEDGER_INDEX_PATH,
+                                          deduplicate_statement,
+                                          open_ledger_index)
 
 # Page configuration
 st.set_page_config(
@@ -37,10 +47,27 @@ with st.sidebar:
     
     gemini_model = st.selectbox(
         "Model",
-        ["gemini-3-flash-preview", "gemini-2.0-flash-exp", "gemini-1.5-pro"],
-        help="Select the Gemini model to use",
+        ["Cascade", "gemini-3-flash-preview", "gemini-2.0-flash-exp", "gemini-1.5-pro"],
+        help="Select the Gemini model to use. Cascade starts with "
+        f"{CASCADE_MODELS[0]} and escalates to {CASCADE_MODELS[-1]} only when quality gates fail",
     )
     
+    skip_boilerplate = st.checkbox(
+        "Skip boilerplate pages",
+        value=True,
+        help="Skip pages (terms, promotions, payment slips) already seen in earlier statements from the same issuer",
+    )
+    
+    fingerprint_store_path = os.getenv("FINGERPRINT_STORE", FINGERPRINT_STORE_PATH)
+    
+    skip_duplicates = st.checkbox(
+        "Skip duplicate transactions",
+        value=True,
+        help="Skip transactions already analyzed from other or overlapping statements",
+    )
+    
+    ledger_index_path = os.getenv("LEDGER_INDEX", LEDGER_INDEX_PATH)
+    
     st.divider()
     
     st.markdown("### About")
@@ -66,6 +93,31 @@ uploaded_files = st.file_uploader(
 if uploaded_files:
     st.success(f"✅ {len(uploaded_files)} file(s) uploaded")
     
+    # Analyze the same file uploaded more than once only once
+    statement_files = {}
+    for uploaded_file in uploaded_files:
+        statement_id = hashlib.sha256(uploaded_file.getbuffer()).hexdigest()
+        if statement_id in statement_files:
+            st.caption(f"Skipping {uploaded_file.name}, same file as {statement_files[statement_id].name}")
+            continue
+        statement_files[statement_id] = uploaded_file
+    
+    # Issuer of each statement, boilerplate pages are only learned within an issuer
+    issuers = {}
+    if skip_boilerplate:
+        fingerprint_store = open_fingerprint_store(fingerprint_store_path)
+        known_issuers = get_known_issuers(fingerprint_store)
+        fingerprint_store.close()
+        with st.expander("🏦 Statement Issuers", expanded=True):
+            for statement_id, uploaded_file in statement_files.items():
+                issuers[statement_id] = st.text_input(
+                    f"Issuer of {uploaded_file.name}",
+                    key=f"issuer_{statement_id}",
+                    placeholder="e.g. hsbc-visa",
+                    help="Known issuers: " + (", ".join(known_issuers) or "none yet")
+                    + ". Leave empty to send every page.",
+                )
+    
     # Process button
     if st.button("🚀 Analyze Statements", type="primary", use_container_width=True):
         all_rows = "date,transaction_name,amount,category,account,card_name\n"
@@ -73,8 +125,13 @@ if uploaded_files:
         # Progress tracking
         progress_bar = st.progress(0)
         status_text = st.empty()
+        cascade_stats = CascadeStats()
+        if skip_boilerplate:
+            fingerprint_store = open_fingerprint_store(fingerprint_store_path)
+        if skip_duplicates:
+            ledger_index = open_ledger_index(ledger_index_path)
         
-        for idx, uploaded_file in enumerate(uploaded_files):
+        for idx, (statement_id, uploaded_file) in enumerate(statement_files.items()):
             status_text.text(f"Processing {uploaded_file.name}...")
             
             # Create temporary directory for this PDF
@@ -95,13 +152,45 @@ if uploaded_files:
                         fmt="png"
                     )
                 
+                # Skip known boilerplate pages for this issuer
+                issuer = issuers.get(statement_id, "").strip().lower()
+                if skip_boilerplate and issuer:
+                    pdf_images, skipped_pages = filter_boilerplate_pages(
+                        pdf_images,
+                        issuer,
+                        statement_id,
+                        fingerprint_store,
+                        str(pdf_path),
+                        verbose=False
+                    )
+                    if skipped_pages:
+                        st.caption(f"Skipped {len(skipped_pages)} boilerplate page(s) in {uploaded_file.name}")
+                
                 # Process with Gemini
                 with st.spinner(f"Analyzing {uploaded_file.name} with Gemini AI..."):
-                    response = read_statement(
-                        gemini_api_key,
-                        gemini_model,
-                        pdf_images
-                    )
+                    if gemini_model == "Cascade":
+                        response = read_statement_cascade(
+                            gemini_api_key,
+                            pdf_images,
+                            CASCADE_MODELS,
+                            cascade_stats,
+                            verbose=False
+                        )
+                    else:
+                        response = read_statement(
+                            gemini_api_key,
+                            gemini_model,
+                            pdf_images
+                        )
+                
+                # Drop transactions already analyzed
+                if skip_duplicates:
+                    response, dedup_report = deduplicate_statement(response, statement_id, ledger_index)
+                    if dedup_report.dropped or dedup_report.merged:
+                        st.caption(
+                            f"Skipped {len(dedup_report.dropped)} duplicate and "
+                            f"{len(dedup_report.merged)} near-duplicate transaction(s) in {uploaded_file.name}"
+                        )
                 
                 # Convert to CSV
                 all_rows += statement_to_csv(response)
@@ -112,17 +201,47 @@ if uploaded_files:
                     with col1:
                         st.metric("Card Name", response.card_name)
                     with col2:
-                        st.metric("Total Spending", f"HKD ${response.total_spending:,.2f}")
+                        st.metric(
+                            "Total Spending",
+                            f"HKD ${sum(transaction.amount for transaction in response.transactions):,.2f}"
+                        )
                     with col3:
-                        st.metric("Transactions", response.number_of_transactions)
+                        st.metric("Transactions", len(response.transactions))
                     
+                    if len(response.transactions) != response.number_of_transactions:
+                        st.caption(
+                            f"Statement total: HKD ${response.total_spending:,.2f} "
+                            f"({response.number_of_transactions} transactions, duplicates included)"
+                        )
                     st.caption(f"Due Date: {response.due_date}")
             
             # Update progress
-            progress_bar.progress((idx + 1) / len(uploaded_files))
+            progress_bar.progress((idx + 1) / len(statement_files))
+        
+        if skip_boilerplate:
+            fingerprint_store.close()
+        if skip_duplicates:
+            ledger_index.close()
         
         status_text.text("✅ All statements processed!")
         
+        if gemini_model == "Cascade":
+            with st.expander("🪜 Cascade Stats"):
+                st.metric("Escalation Rate", f"{cascade_stats.escalation_rate:.0%}")
+                st.dataframe(
+                    pd.DataFrame([
+                        {
+                            "model": model,
+                            "calls": tier.calls,
+                            "statements": tier.statements,
+                            "passed": tier.passed,
+                            "avg_latency_s": round(tier.average_latency, 1),
+                        }
+                        for model, tier in cascade_stats.tiers.items()
+                    ]),
+                    use_container_width=True,
+                )
+        
         # Parse CSV into DataFrame
         from io import StringIO
         df = pd.read_csv(StringIO(all_rows))
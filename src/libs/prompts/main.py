@@ -70,3 +70,10 @@ OCTOPUS
 
 For Account, please use one of the following: Personal, Business. Only Cloud Services can be categorized under Business, all other transactions should be under Personal.
 """
+
+PACKED_STATEMENT_READER_INSTRUCTIONS = """
+The images below belong to several different credit card statements.
+The pages of each statement are preceded by a text marker in the format 'Document: <id>'.
+Analyze each statement separately and return one statement per document, never merge transactions from different documents.
+Set source_document of each statement to the <id> of its marker, exactly as written.
+"""
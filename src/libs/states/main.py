@@ -1,5 +1,19 @@
 from pydantic import BaseModel, Field
 
+TRANSACTION_CATEGORIES = [
+    "Cloud Services",
+    "Dining",
+    "Entertainment",
+    "Fuel",
+    "Health",
+    "Insurance",
+    "Others",
+    "Shopping",
+    "Telecom",
+    "Travel",
+    "Utilities",
+]
+
 
 class Transaction(BaseModel):
     """Individual transaction with name and amount."""
@@ -35,3 +49,20 @@ class Statement(BaseModel):
     due_date: str = Field(
         description="Due date of the statement",
     )
+
+
+class PackedStatement(Statement):
+    """Statement read from a packed request, tagged with its source document."""
+
+    source_document: str = Field(
+        description="Identifier of the document the statement was read from, exactly as given in the document marker",
+    )
+
+
+class PackedStatements(BaseModel):
+    """Structured output returned by the statement reader agent for packed requests."""
+
+    statements: list[PackedStatement] = Field(
+        description="List of statements, one per document",
+        default_factory=list
+    )
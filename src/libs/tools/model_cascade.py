@@ -0,0 +1,131 @@
+"""
+Model Cascade Module
+
+This module reads statements with the cheapest model first and only
+escalates to stronger models when the result fails the quality gates.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from libs.states.main import Statement
+from libs.tools.quality_gates import check_statement
+from libs.tools.statement_reader import read_statement
+
+# Models ordered from the cheapest/fastest to the strongest
+CASCADE_MODELS = ["gemini-3-flash-preview", "gemini-3-pro-preview"]
+
+
+@dataclass
+class TierStats:
+    """Call count, latency, statement count and pass count of a single cascade tier."""
+
+    calls: int = 0
+    statements: int = 0
+    passed: int = 0
+    total_latency: float = 0.0
+
+    @property
+    def average_latency(self) -> float:
+        return self.total_latency / self.calls if self.calls else 0.0
+
+
+@dataclass
+class CascadeStats:
+    """Per-tier statistics and escalation rate across cascade runs."""
+
+    tiers: Dict[str, TierStats] = field(default_factory=dict)
+    statements: int = 0
+    escalations: int = 0
+
+    @property
+    def escalation_rate(self) -> float:
+        return self.escalations / self.statements if self.statements else 0.0
+
+    def summary(self) -> str:
+        lines = [f"Statements: {self.statements}, escalation rate: {self.escalation_rate:.0%}"]
+        for model, tier in self.tiers.items():
+            lines.append(
+                f"{model}: {tier.calls} call(s), {tier.statements} statement(s), {tier.passed} passed, "
+                f"avg latency {tier.average_latency:.1f}s"
+            )
+        return "\n".join(lines)
+
+
+def read_statement_cascade(
+    gemini_api_key: str,
+    image_paths: list[str],
+    models: Optional[List[str]] = None,
+    stats: Optional[CascadeStats] = None,
+    first_tier: int = 0,
+    verbose: bool = True
+) -> Statement:
+    """
+    Read a statement with a cascade of models guarded by quality gates.
+
+    Each model is tried in order until one returns a statement that passes
+    `check_statement`. If no model passes, the result of the last model
+    that returned a statement is used. Callers that already tried the first
+    tiers (e.g. a packed request) start at `first_tier`, the statement and
+    its escalation are then expected to be counted by the caller.
+
+    Args:
+        gemini_api_key: Gemini API key
+        image_paths: Paths to the page images of the statement
+        models: Models ordered from cheapest to strongest (default: CASCADE_MODELS)
+        stats: Optional CascadeStats updated with latency and escalations
+        first_tier: Index of the first model to try (default: 0)
+        verbose: Print progress messages (default: True)
+
+    Returns:
+        Statement object
+
+    Raises:
+        Exception: If every model fails to return a statement
+    """
+    models = models or CASCADE_MODELS
+    stats = stats if stats is not None else CascadeStats()
+    if first_tier == 0:
+        stats.statements += 1
+
+    statement = None
+    error = None
+
+    for tier in range(first_tier, len(models)):
+        model = models[tier]
+        if tier > 0:
+            if tier == 1 and first_tier == 0:
+                stats.escalations += 1
+            if verbose:
+                print(f"Escalating to {model}...")
+
+        tier_stats = stats.tiers.setdefault(model, TierStats())
+        tier_stats.calls += 1
+        tier_stats.statements += 1
+
+        start = time.perf_counter()
+        try:
+            statement = read_statement(gemini_api_key, model, image_paths)
+        except Exception as e:
+            error = e
+            if verbose:
+                print(f"{model} failed: {e}")
+            continue
+        finally:
+            tier_stats.total_latency += time.perf_counter() - start
+
+        failures = check_statement(statement)
+        if not failures:
+            tier_stats.passed += 1
+            return statement
+
+        if verbose:
+            print(f"{model} failed quality gates:")
+            for failure in failures:
+                print(f"  - {failure}")
+
+    if statement is None:
+        raise error
+
+    return statement
@@ -0,0 +1,277 @@
+"""
+Page Fingerprint Module
+
+This module provides utilities to detect boilerplate statement pages
+(terms and conditions, promotions, payment slips) with digests of their
+text layer, so they can be dropped before being sent to Gemini.
+"""
+
+import hashlib
+import re
+import sqlite3
+import subprocess
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from PIL import Image
+
+# Default path of the fingerprint store, relative to the working directory
+FINGERPRINT_STORE_PATH = "statements/fingerprints.db"
+
+# Number of distinct statements a page must appear in to become boilerplate
+MIN_STATEMENTS = 2
+
+# Number of latest statements per issuer whose pages are remembered until they recur
+MAX_STATEMENTS = 12
+
+# Month names, masked together with digits so dated pages still match
+MONTHS = r"JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC"
+
+
+def get_pdf_page_texts(pdf_path: str) -> List[str]:
+    """
+    Get the text layer of every page of a PDF with pdftotext.
+
+    Args:
+        pdf_path: Path to the PDF file
+
+    Returns:
+        List of page texts, empty if pdftotext is unavailable or fails
+    """
+    try:
+        result = subprocess.run(
+            ["pdftotext", "-layout", pdf_path, "-"],
+            capture_output=True,
+            check=True,
+            text=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return []
+
+    # Pages are separated by form feeds, the last one is followed by one too
+    return result.stdout.split("\f")[:-1]
+
+
+def mask_page_text(text: str) -> str:
+    """
+    Mask the parts of a page text that change every statement.
+
+    Digits (amounts, dates, account and page numbers) and month names are
+    replaced and whitespace is collapsed, so a payment slip with a new
+    amount due and due date gives the same text.
+
+    Args:
+        text: Text layer of a page
+
+    Returns:
+        Masked upper case text
+    """
+    masked = re.sub(rf"\b({MONTHS})[A-Z]*\b", "#", text.upper())
+    masked = re.sub(r"\d+([.,:/-]\d+)*", "#", masked)
+    return " ".join(masked.split())
+
+
+def compute_page_hash(image_path: str, page_text: str = "") -> str:
+    """
+    Compute the digest of a page.
+
+    Pages with a text layer are digested from their masked text, so pages
+    that only differ by amounts or dates match while pages listing different
+    merchants do not. Pages without a text layer (e.g. scanned statements)
+    fall back to a digest of their pixels, which only matches identical pages.
+
+    Args:
+        image_path: Path to the page image
+        page_text: Text layer of the page (default: no text layer)
+
+    Returns:
+        Digest as a hexadecimal string
+    """
+    masked = mask_page_text(page_text)
+    if masked.strip("# "):
+        return hashlib.sha256(f"text:{masked}".encode("utf-8")).hexdigest()
+
+    with Image.open(image_path) as image:
+        grayscale = image.convert("L")
+        digest = hashlib.sha256(f"pixels:{grayscale.width}x{grayscale.height}".encode("utf-8"))
+        digest.update(grayscale.tobytes())
+
+    return digest.hexdigest()
+
+
+def get_issuer(name: str) -> str:
+    """
+    Get the issuer name of a statement from its folder or file name.
+
+    Statements are named like `bank-name-YYYYMM`, the trailing period
+    is stripped so all statements of an issuer share one fingerprint set.
+
+    Args:
+        name: Folder or file name of the statement, without extension
+
+    Returns:
+        Issuer name
+    """
+    issuer, _, period = re.sub(r"[_ ]", "-", name).rpartition("-")
+    if issuer and period.isdigit():
+        return issuer.lower()
+    return name.lower()
+
+
+def open_fingerprint_store(store_path: str = FINGERPRINT_STORE_PATH) -> sqlite3.Connection:
+    """
+    Open the per-issuer fingerprint store, creating it if needed.
+
+    Args:
+        store_path: Path to the SQLite store file (default: statements/fingerprints.db)
+
+    Returns:
+        Connection to the store, close it when done
+    """
+    Path(store_path).parent.mkdir(parents=True, exist_ok=True)
+    store = sqlite3.connect(store_path)
+    store.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS statements (
+            issuer TEXT NOT NULL,
+            statement_id TEXT NOT NULL,
+            processed_at REAL NOT NULL,
+            PRIMARY KEY (issuer, statement_id)
+        );
+        CREATE TABLE IF NOT EXISTS pages (
+            issuer TEXT NOT NULL,
+            digest TEXT NOT NULL,
+            statement_id TEXT NOT NULL,
+            PRIMARY KEY (issuer, digest, statement_id)
+        );
+        CREATE TABLE IF NOT EXISTS boilerplate (
+            issuer TEXT NOT NULL,
+            digest TEXT NOT NULL,
+            statement_id TEXT NOT NULL,
+            PRIMARY KEY (issuer, digest, statement_id)
+        );
+        """
+    )
+    return store
+
+
+def get_known_issuers(store: sqlite3.Connection) -> List[str]:
+    """
+    Get the issuers that have statements in the fingerprint store.
+
+    Args:
+        store: Store opened with `open_fingerprint_store`
+
+    Returns:
+        Sorted list of issuer names
+    """
+    rows = store.execute("SELECT DISTINCT issuer FROM statements ORDER BY issuer")
+    return [row[0] for row in rows]
+
+
+def _prune_pages(store: sqlite3.Connection, issuer: str, max_statements: int) -> None:
+    """Forget pages of statements older than the latest max_statements of the issuer."""
+    store.execute(
+        """
+        DELETE FROM pages WHERE issuer = ? AND statement_id NOT IN (
+            SELECT statement_id FROM statements WHERE issuer = ?
+            ORDER BY processed_at DESC LIMIT ?
+        )
+        """,
+        (issuer, issuer, max_statements)
+    )
+
+
+def filter_boilerplate_pages(
+    image_paths: List[str],
+    issuer: str,
+    statement_id: str,
+    store: sqlite3.Connection,
+    pdf_path: Optional[str] = None,
+    min_statements: int = MIN_STATEMENTS,
+    max_statements: int = MAX_STATEMENTS,
+    verbose: bool = True
+) -> Tuple[List[str], List[str]]:
+    """
+    Drop known boilerplate pages and learn new ones.
+
+    Every page digest is recorded against the statement it came from. Once a
+    page has been seen in `min_statements` distinct statements of the same
+    issuer it is considered boilerplate and dropped from later statements.
+    Pages are never dropped from the statements they were learned from, so
+    processing a statement again gives the same pages. Pages that never
+    became boilerplate are forgotten once they are older than the latest
+    `max_statements` statements of the issuer.
+
+    Args:
+        image_paths: Paths to the page images of a statement, one per PDF page in order
+        issuer: Issuer name the statement belongs to
+        statement_id: Unique identifier of the statement, e.g. the PDF digest
+        store: Store opened with `open_fingerprint_store`
+        pdf_path: Path to the PDF file, used to read the text layer of the pages
+        min_statements: Statements a page must appear in to be boilerplate (default: 2)
+        max_statements: Latest statements per issuer whose pages are remembered (default: 12)
+        verbose: Print progress messages (default: True)
+
+    Returns:
+        Tuple of (kept page paths, dropped page paths)
+    """
+    page_texts = get_pdf_page_texts(pdf_path) if pdf_path else []
+    if len(page_texts) != len(image_paths):
+        page_texts = [""] * len(image_paths)
+
+    store.execute(
+        "INSERT OR REPLACE INTO statements VALUES (?, ?, ?)",
+        (issuer, statement_id, time.time())
+    )
+
+    kept_pages = []
+    dropped_pages = []
+
+    for image_path, page_text in zip(image_paths, page_texts):
+        digest = compute_page_hash(image_path, page_text)
+
+        learned_from = [
+            row[0] for row in store.execute(
+                "SELECT statement_id FROM boilerplate WHERE issuer = ? AND digest = ?",
+                (issuer, digest)
+            )
+        ]
+        if learned_from:
+            if statement_id in learned_from:
+                kept_pages.append(image_path)
+            else:
+                dropped_pages.append(image_path)
+            continue
+
+        store.execute("INSERT OR IGNORE INTO pages VALUES (?, ?, ?)", (issuer, digest, statement_id))
+        statements = [
+            row[0] for row in store.execute(
+                "SELECT statement_id FROM pages WHERE issuer = ? AND digest = ?",
+                (issuer, digest)
+            )
+        ]
+
+        # Remember the statements it was learned from, they keep the page
+        if len(statements) >= min_statements:
+            store.executemany(
+                "INSERT OR IGNORE INTO boilerplate VALUES (?, ?, ?)",
+                [(issuer, digest, seen_in) for seen_in in statements]
+            )
+            store.execute("DELETE FROM pages WHERE issuer = ? AND digest = ?", (issuer, digest))
+
+        kept_pages.append(image_path)
+
+    _prune_pages(store, issuer, max_statements)
+    store.commit()
+
+    # Never drop every page, the statement may be laid out like a known one
+    if not kept_pages:
+        kept_pages, dropped_pages = dropped_pages, []
+
+    if verbose:
+        for image_path in dropped_pages:
+            print(f"Skipped boilerplate page: {image_path}")
+
+    return kept_pages, dropped_pages
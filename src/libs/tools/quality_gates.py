@@ -0,0 +1,51 @@
+"""
+Quality Gates Module
+
+This module provides checks to decide whether a statement read by Gemini
+can be trusted or should be read again with a stronger model.
+"""
+
+from datetime import datetime
+from typing import List
+
+from libs.states.main import TRANSACTION_CATEGORIES, Statement
+
+# Maximum difference allowed between the transaction sum and the statement total
+SUM_TOLERANCE = 1.0
+
+
+def check_statement(statement: Statement, sum_tolerance: float = SUM_TOLERANCE) -> List[str]:
+    """
+    Check a statement against the quality gates.
+
+    Args:
+        statement: Statement object returned by the statement reader
+        sum_tolerance: Maximum difference between the transaction sum and
+            the statement total (default: 1.0)
+
+    Returns:
+        List of failure messages, empty if all gates pass
+    """
+    failures = []
+
+    transaction_sum = sum(transaction.amount for transaction in statement.transactions)
+    if abs(transaction_sum - statement.total_spending) > sum_tolerance:
+        failures.append(
+            f"Transaction sum {transaction_sum:,.2f} does not match total spending {statement.total_spending:,.2f}"
+        )
+
+    if len(statement.transactions) != statement.number_of_transactions:
+        failures.append(
+            f"Found {len(statement.transactions)} transactions, expected {statement.number_of_transactions}"
+        )
+
+    for transaction in statement.transactions:
+        try:
+            datetime.strptime(transaction.date, "%Y-%m-%d")
+        except ValueError:
+            failures.append(f"Invalid date '{transaction.date}' for {transaction.transaction_name}")
+
+        if transaction.category not in TRANSACTION_CATEGORIES:
+            failures.append(f"Unknown category '{transaction.category}' for {transaction.transaction_name}")
+
+    return failures
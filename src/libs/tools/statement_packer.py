@@ -0,0 +1,164 @@
+"""
+Statement Packer Module
+
+This module groups several small statements into a single Gemini request
+to amortize the per-request overhead, and splits the result back out.
+"""
+
+import time
+from typing import Dict, List, Optional
+
+from libs.states.main import Statement
+from libs.tools.model_cascade import (CascadeStats, TierStats,
+                                      read_statement_cascade)
+from libs.tools.quality_gates import check_statement
+from libs.tools.statement_reader import read_statements_packed
+
+# Maximum number of pages sent in a single packed request
+MAX_PAGES = 8
+
+# Maximum number of estimated input tokens in a single packed request
+MAX_TOKENS = 12000
+
+# Estimated input tokens of a single page image
+TOKENS_PER_PAGE = 1120
+
+# Estimated input tokens of the instructions sent with every request
+PROMPT_TOKENS = 800
+
+
+def pack_documents(
+    documents: Dict[str, List[str]],
+    max_pages: int = MAX_PAGES,
+    max_tokens: int = MAX_TOKENS
+) -> List[List[str]]:
+    """
+    Group documents into packs that respect the page and token limits.
+
+    Documents are packed in order, a new pack is started whenever the next
+    document would exceed a limit, so the same input always gives the same
+    packs. A document larger than the limits is put in a pack of its own.
+
+    Args:
+        documents: Mapping of document id to its page image paths
+        max_pages: Maximum number of pages per pack (default: 8)
+        max_tokens: Maximum estimated input tokens per pack (default: 12000)
+
+    Returns:
+        List of packs, each a list of document ids
+    """
+    packs = []
+    current_pack = []
+    current_pages = 0
+
+    for document_id, image_paths in documents.items():
+        pages = current_pages + len(image_paths)
+        tokens = PROMPT_TOKENS + pages * TOKENS_PER_PAGE
+
+        if current_pack and (pages > max_pages or tokens > max_tokens):
+            packs.append(current_pack)
+            current_pack = []
+            current_pages = 0
+
+        current_pack.append(document_id)
+        current_pages += len(image_paths)
+
+    if current_pack:
+        packs.append(current_pack)
+
+    return packs
+
+
+def read_statements_with_packing(
+    gemini_api_key: str,
+    models: List[str],
+    documents: Dict[str, List[str]],
+    max_pages: int = MAX_PAGES,
+    max_tokens: int = MAX_TOKENS,
+    stats: Optional[CascadeStats] = None,
+    verbose: bool = True
+) -> Dict[str, Statement]:
+    """
+    Read statements with several small statements packed per request.
+
+    Packed requests use the first model of `models`. Every statement of a
+    pack must come back exactly once and pass `check_statement`, otherwise
+    it is read again on its own with the next model, or with the same model
+    when `models` has only one. Statements alone in a pack go through the
+    whole cascade.
+
+    Args:
+        gemini_api_key: Gemini API key
+        models: Models ordered from cheapest to strongest
+        documents: Mapping of document id to its page image paths
+        max_pages: Maximum number of pages per pack (default: 8)
+        max_tokens: Maximum estimated input tokens per pack (default: 12000)
+        stats: Optional CascadeStats updated with packed calls and escalations
+        verbose: Print progress messages (default: True)
+
+    Returns:
+        Mapping of document id to Statement, in the order of documents
+    """
+    stats = stats if stats is not None else CascadeStats()
+    fallback_tier = min(1, len(models) - 1)
+    statements = {}
+
+    for pack in pack_documents(documents, max_pages, max_tokens):
+        if len(pack) == 1:
+            statements[pack[0]] = read_statement_cascade(
+                gemini_api_key, documents[pack[0]], models, stats, verbose=verbose
+            )
+            continue
+
+        if verbose:
+            print(f"Reading {len(pack)} statements in one request...")
+
+        # Short markers are easier for the model to copy back than file paths
+        markers = {f"doc-{i + 1}": document_id for i, document_id in enumerate(pack)}
+
+        tier_stats = stats.tiers.setdefault(models[0], TierStats())
+        tier_stats.calls += 1
+        tier_stats.statements += len(pack)
+
+        start = time.perf_counter()
+        try:
+            response = read_statements_packed(
+                gemini_api_key,
+                models[0],
+                {marker: documents[document_id] for marker, document_id in markers.items()}
+            )
+            packed_statements = response.statements
+        except Exception as e:
+            if verbose:
+                print(f"Packed request failed: {e}")
+            packed_statements = []
+        finally:
+            tier_stats.total_latency += time.perf_counter() - start
+
+        # Split back out by marker, ignoring unknown and repeated markers
+        matches = {}
+        for packed_statement in packed_statements:
+            matches.setdefault(packed_statement.source_document, []).append(packed_statement)
+
+        for marker, document_id in markers.items():
+            found = matches.get(marker, [])
+            if len(found) == 1:
+                statement = Statement(**found[0].model_dump(exclude={"source_document"}))
+                if not check_statement(statement):
+                    stats.statements += 1
+                    tier_stats.passed += 1
+                    statements[document_id] = statement
+                    continue
+
+            if verbose:
+                print(f"Statement {document_id} failed validation after packing, reading on its own...")
+
+            # The packed request was the first tier, go straight to the next one
+            if fallback_tier > 0:
+                stats.statements += 1
+                stats.escalations += 1
+            statements[document_id] = read_statement_cascade(
+                gemini_api_key, documents[document_id], models, stats, fallback_tier, verbose
+            )
+
+    return {document_id: statements[document_id] for document_id in documents}
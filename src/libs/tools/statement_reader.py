@@ -1,21 +1,15 @@
 from google import genai
 from langchain.messages import HumanMessage
-from prompts.main import STATEMENT_READER_INSTUCTIONS
-from states.main import Statement
+from prompts.main import (PACKED_STATEMENT_READER_INSTRUCTIONS,
+                          STATEMENT_READER_INSTUCTIONS)
+from states.main import PackedStatements, Statement
 
 from libs.gemini.main import init_langchain_model
 
 
-def read_statement(gemini_api_key: str, gemini_model: str, image_paths: list[str]) -> Statement:
-
-    # Init model
-    model = init_langchain_model(gemini_api_key, gemini_model)
-
-    # Set up structured output model
-    structured_output_model = model.with_structured_output(Statement)
+def upload_images(client, image_paths: list[str]) -> list[dict]:
 
     # Upload and wait for processing
-    client = genai.Client()
     uploaded_files = []
     for file in image_paths:
         uploaded_file = client.files.upload(file=file)
@@ -25,6 +19,21 @@ def read_statement(gemini_api_key: str, gemini_model: str, image_paths: list[str
             "mime_type": "image/png",
         })
 
+    return uploaded_files
+
+
+def read_statement(gemini_api_key: str, gemini_model: str, image_paths: list[str]) -> Statement:
+
+    # Init model
+    model = init_langchain_model(gemini_api_key, gemini_model)
+
+    # Set up structured output model
+    structured_output_model = model.with_structured_output(Statement)
+
+    # Upload and wait for processing
+    client = genai.Client()
+    uploaded_files = upload_images(client, image_paths)
+
     content = [{"type": "text", "text": STATEMENT_READER_INSTUCTIONS}
                ] + uploaded_files
 
@@ -33,3 +42,25 @@ def read_statement(gemini_api_key: str, gemini_model: str, image_paths: list[str
     response = structured_output_model.invoke([message])
 
     return response
+
+
+def read_statements_packed(gemini_api_key: str, gemini_model: str, documents: dict[str, list[str]]) -> PackedStatements:
+
+    # Init model
+    model = init_langchain_model(gemini_api_key, gemini_model)
+
+    # Set up structured output model
+    structured_output_model = model.with_structured_output(PackedStatements)
+
+    # Upload and wait for processing, each document is preceded by its marker
+    client = genai.Client()
+    content = [{"type": "text", "text": STATEMENT_READER_INSTUCTIONS + PACKED_STATEMENT_READER_INSTRUCTIONS}]
+    for document_id, image_paths in documents.items():
+        content.append({"type": "text", "text": f"Document: {document_id}"})
+        content += upload_images(client, image_paths)
+
+    message = HumanMessage(content=content)
+
+    response = structured_output_model.invoke([message])
+
+    return response
@@ -0,0 +1,268 @@
+"""
+Transaction Dedup Module
+
+This module drops transactions that were already ingested from another
+statement, e.g. overlapping statement periods or re-downloaded PDFs,
+using a persistent index of everything ingested so far.
+"""
+
+import hashlib
+import re
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import List, Tuple
+
+from libs.states.main import Statement, Transaction
+
+# Default path of the ledger index, relative to the working directory
+LEDGER_INDEX_PATH = "statements/ledger_index.db"
+
+# Maximum number of days between two near-matching transactions
+DATE_WINDOW = 3
+
+# Minimum merchant name similarity (0 to 1) for two near-matching transactions
+MERCHANT_SIMILARITY = 0.8
+
+
+@dataclass
+class DedupReport:
+    """Transactions kept, dropped as exact duplicates and merged as near-matches."""
+
+    kept: List[Transaction] = field(default_factory=list)
+    dropped: List[Tuple[Transaction, dict]] = field(default_factory=list)
+    merged: List[Tuple[Transaction, dict]] = field(default_factory=list)
+
+    def summary(self) -> str:
+        lines = [f"Kept {len(self.kept)}, dropped {len(self.dropped)}, merged {len(self.merged)} transaction(s)"]
+        for transaction, entry in self.dropped:
+            lines.append(
+                f"  dropped: {transaction.date} {transaction.transaction_name} {transaction.amount:,.2f} "
+                f"(already in {entry['source']})"
+            )
+        for transaction, entry in self.merged:
+            lines.append(
+                f"  merged: {transaction.date} {transaction.transaction_name} {transaction.amount:,.2f} "
+                f"with {entry['date']} {entry['merchant']} (from {entry['source']})"
+            )
+        return "\n".join(lines)
+
+
+def normalize_merchant(name: str) -> str:
+    """
+    Normalize a merchant name for comparison.
+
+    Args:
+        name: Transaction name as read from the statement
+
+    Returns:
+        Upper case merchant name with only letters and digits
+    """
+    return re.sub(r"[^A-Z0-9]", "", name.upper())
+
+
+def transaction_key(transaction: Transaction, occurrence: int = 1) -> str:
+    """
+    Get the hash key of a transaction.
+
+    Identical transactions within the same statement (e.g. two coffees on
+    the same day) are told apart by their occurrence number.
+
+    Args:
+        transaction: Transaction to hash
+        occurrence: Occurrence of the same transaction within the statement (default: 1)
+
+    Returns:
+        Hash key as a hexadecimal string
+    """
+    parts = [
+        transaction.date,
+        f"{round(transaction.amount * 100)}",
+        normalize_merchant(transaction.transaction_name),
+        normalize_merchant(transaction.card_name),
+        f"{occurrence}",
+    ]
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def _bucket_key(transaction: Transaction) -> str:
+    """Return the card and amount bucket used for near-match lookups."""
+    return f"{normalize_merchant(transaction.card_name)}|{round(transaction.amount * 100)}"
+
+
+def open_ledger_index(index_path: str = LEDGER_INDEX_PATH) -> sqlite3.Connection:
+    """
+    Open the index of ingested transactions, creating it if needed.
+
+    Transactions are keyed by their hash and indexed by card/amount bucket,
+    so lookups and inserts only touch the rows of the new transactions.
+    The date range of every ingested statement is kept alongside them.
+
+    Args:
+        index_path: Path to the SQLite index file (default: statements/ledger_index.db)
+
+    Returns:
+        Connection to the index, close it when done
+    """
+    Path(index_path).parent.mkdir(parents=True, exist_ok=True)
+    index = sqlite3.connect(index_path)
+    index.row_factory = sqlite3.Row
+    index.execute(
+        """
+        CREATE TABLE IF NOT EXISTS transactions (
+            key TEXT PRIMARY KEY,
+            bucket TEXT NOT NULL,
+            date TEXT NOT NULL,
+            amount REAL NOT NULL,
+            merchant TEXT NOT NULL,
+            card TEXT NOT NULL,
+            source TEXT NOT NULL
+        )
+        """
+    )
+    index.execute("CREATE INDEX IF NOT EXISTS transactions_bucket ON transactions (bucket)")
+    index.execute(
+        """
+        CREATE TABLE IF NOT EXISTS sources (
+            source TEXT PRIMARY KEY,
+            min_date TEXT NOT NULL,
+            max_date TEXT NOT NULL
+        )
+        """
+    )
+    index.commit()
+    return index
+
+
+def _parse_date(date: str) -> datetime | None:
+    """Return the parsed YYYY-MM-DD date, or None if it is invalid."""
+    try:
+        return datetime.strptime(date, "%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+def _find_near_match(
+    transaction: Transaction,
+    source: str,
+    index: sqlite3.Connection,
+    matched_keys: set,
+    date_window: int,
+    merchant_similarity: float
+) -> dict | None:
+    """Return the ingested near-match from another statement covering the same date."""
+    date = _parse_date(transaction.date)
+    if date is None:
+        return None
+
+    merchant = normalize_merchant(transaction.transaction_name)
+
+    # Only statements whose period covers the date can list the same transaction
+    rows = index.execute(
+        """
+        SELECT transactions.* FROM transactions
+        JOIN sources ON sources.source = transactions.source
+        WHERE transactions.bucket = ? AND transactions.source != ?
+            AND sources.min_date <= ? AND sources.max_date >= ?
+        """,
+        (_bucket_key(transaction), source, transaction.date, transaction.date)
+    )
+    for row in rows:
+        entry = dict(row)
+        if entry["key"] in matched_keys:
+            continue
+
+        entry_date = _parse_date(entry["date"])
+        if entry_date is None or abs((entry_date - date).days) > date_window:
+            continue
+
+        if SequenceMatcher(None, merchant, entry["merchant"]).ratio() >= merchant_similarity:
+            return entry
+
+    return None
+
+
+def deduplicate_statement(
+    statement: Statement,
+    source: str,
+    index: sqlite3.Connection,
+    date_window: int = DATE_WINDOW,
+    merchant_similarity: float = MERCHANT_SIMILARITY
+) -> Tuple[Statement, DedupReport]:
+    """
+    Drop transactions of a statement that were already ingested.
+
+    Transactions are first matched exactly by date, amount, merchant and
+    card. The rest are matched against transactions of other statements
+    whose date range covers the transaction, with the same card and
+    amount, within `date_window` days and with a similar merchant name.
+    Recurring charges in consecutive statements therefore never match. Only the card/amount bucket of each new
+    transaction is looked up, never the whole history. Transactions already
+    ingested from the same source are kept, so ingesting a statement again
+    gives the same result. Kept transactions are added to the index.
+
+    Args:
+        statement: Statement object returned by the statement reader
+        source: Unique identifier of the statement, e.g. the PDF digest
+        index: Index opened with `open_ledger_index`
+        date_window: Maximum days between near-matches (default: 3)
+        merchant_similarity: Minimum merchant similarity of near-matches (default: 0.8)
+
+    Returns:
+        Tuple of (statement with only new transactions, dedup report)
+    """
+    report = DedupReport()
+    occurrences = {}
+    matched_keys = set()
+    new_entries = []
+
+    for transaction in statement.transactions:
+        base_key = transaction_key(transaction)
+        occurrences[base_key] = occurrences.get(base_key, 0) + 1
+        key = transaction_key(transaction, occurrences[base_key])
+
+        row = index.execute("SELECT * FROM transactions WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            matched_keys.add(key)
+            if row["source"] == source:
+                report.kept.append(transaction)
+            else:
+                report.dropped.append((transaction, dict(row)))
+            continue
+
+        near_entry = _find_near_match(transaction, source, index, matched_keys, date_window, merchant_similarity)
+        if near_entry:
+            matched_keys.add(near_entry["key"])
+            report.merged.append((transaction, near_entry))
+            continue
+
+        report.kept.append(transaction)
+        new_entries.append((
+            key,
+            _bucket_key(transaction),
+            transaction.date,
+            transaction.amount,
+            normalize_merchant(transaction.transaction_name),
+            transaction.card_name,
+            source,
+        ))
+
+    # Index new transactions only after matching, so a statement never matches itself
+    index.executemany("INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?)", new_entries)
+
+    dates = [transaction.date for transaction in statement.transactions if _parse_date(transaction.date)]
+    if dates:
+        index.execute(
+            """
+            INSERT INTO sources VALUES (?, ?, ?)
+            ON CONFLICT (source) DO UPDATE SET
+                min_date = MIN(min_date, excluded.min_date),
+                max_date = MAX(max_date, excluded.max_date)
+            """,
+            (source, min(dates), max(dates))
+        )
+    index.commit()
+
+    return statement.model_copy(update={"transactions": report.kept}), report
@@ -1,46 +1,111 @@
+import hashlib
 import logging
 import os
+from pathlib import Path
 
 from libs.gemini.main import init_gemini_client, read_images
+from libs.tools.model_cascade import (CASCADE_MODELS, CascadeStats,
+                                      read_statement_cascade)
+from libs.tools.page_fingerprint import (FINGERPRINT_STORE_PATH,
+                                         filter_boilerplate_pages, get_issuer,
+                                         open_fingerprint_store)
 from libs.tools.pdf_2_image import convert_pdf_to_images, get_pdf_files
 from libs.tools.state_2_csv import statement_to_csv
-from libs.tools.statement_reader import read_statement
+from libs.tools.statement_packer import read_statements_with_packing
+from libs.tools.transaction_dedup import (LEDGER_INDEX_PATH,
+                                          deduplicate_statement,
+                                          open_ledger_index)
 
 # logging.basicConfig(level=logging.DEBUG)
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
 GEMINI_MODEL = "gemini-3-flash-preview"
 
+# read with the cheapest model first, escalate when quality gates fail
+USE_CASCADE = True
+GEMINI_MODELS = CASCADE_MODELS if USE_CASCADE else [GEMINI_MODEL]
+cascade_stats = CascadeStats()
+
+# pack several small statements into a single request
+USE_PACKING = True
+PACKING_MAX_PAGES = 8
+PACKING_MAX_TOKENS = 12000
+
 pdf_folder = f"{os.getcwd()}/statements"
 pdf_files = get_pdf_files(pdf_folder)
 
-print("PDF Files Found:")
-pdf_images = []
+# known boilerplate pages (terms, promotions, payment slips) per issuer
+fingerprint_store = open_fingerprint_store(os.getenv("FINGERPRINT_STORE", FINGERPRINT_STORE_PATH))
+
+# every transaction ingested so far, to skip duplicates across statements
+ledger_index = open_ledger_index(os.getenv("LEDGER_INDEX", LEDGER_INDEX_PATH))
 
+print("PDF Files Found:")
 statement_rows = "date,transaction_name,amount,category,account,card_name\n"
 
+documents = {}
+statement_ids = {}
+
 for pdf in pdf_files:
 
     print(pdf)
+    # statements are identified by content, so moving the folder keeps them known
+    statement_id = hashlib.sha256(Path(pdf).read_bytes()).hexdigest()
+    if statement_id in statement_ids.values():
+        print("Same file as an earlier statement, skipped")
+        continue
+    statement_ids[pdf] = statement_id
+
     # 1. convert pdf to images
     output_path = f"{pdf.replace(".pdf", "")}/images"
     pdf_images = convert_pdf_to_images(pdf, output_path, fmt="png")
 
-    # 2. send pdf images to gemini for analysis
-    print("Files to be sent to Gemini:")
+    # skip pages already known as boilerplate for this issuer
+    issuer = get_issuer(os.path.basename(os.path.dirname(pdf)))
+    pdf_images, _ = filter_boilerplate_pages(pdf_images, issuer, statement_id, fingerprint_store, pdf)
+
+    documents[pdf] = pdf_images
+
+fingerprint_store.close()
+
+
+# 2. send pdf images to gemini for analysis
+print("Files to be sent to Gemini:")
+for pdf_images in documents.values():
     for img in pdf_images:
         print(img)
 
-    # direct call Gemini API
-    # gemini_client = init_gemini_client(GEMINI_API_KEY)
-    # response = read_images(gemini_client, GEMINI_MODEL, pdf_images)
+# direct call Gemini API
+# gemini_client = init_gemini_client(GEMINI_API_KEY)
+# response = read_images(gemini_client, GEMINI_MODEL, pdf_images)
+
+# or via LangChain wrapper
+if USE_PACKING:
+    # small statements share a request, failures are read on their own
+    responses = read_statements_with_packing(
+        GEMINI_API_KEY, GEMINI_MODELS, documents, PACKING_MAX_PAGES, PACKING_MAX_TOKENS, cascade_stats
+    )
+else:
+    responses = {
+        pdf: read_statement_cascade(GEMINI_API_KEY, pdf_images, GEMINI_MODELS, cascade_stats)
+        for pdf, pdf_images in documents.items()
+    }
 
-    # or via LangChain wrapper
-    response = read_statement(GEMINI_API_KEY, GEMINI_MODEL, pdf_images)
+for pdf, response in responses.items():
+    # 3. drop transactions already ingested from other statements
+    response, dedup_report = deduplicate_statement(response, statement_ids[pdf], ledger_index)
+    print(dedup_report.summary())
 
     statement_rows += statement_to_csv(response)
 
-    print(f"Statement {output_path} done")
+    print(f"Statement {pdf} done")
+    print("----------------------------------------------------------------")
+
+ledger_index.close()
+
+if USE_CASCADE:
+    print("Cascade Stats:")
+    print(cascade_stats.summary())
     print("----------------------------------------------------------------")
 
 print("CSV Output:")